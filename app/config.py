@@ -6,6 +6,7 @@ All settings can be overridden via environment variables or a `.env` file.
 """
 
 import os
+from functools import lru_cache
 from pydantic_settings import BaseSettings
 
 
@@ -24,6 +25,10 @@ class Settings(BaseSettings):
     # Placeholder API key for future OpenAI/Gemini integration
     LLM_API_KEY: str | None = os.getenv("LLM_API_KEY")
 
+    # ==== Uploads ====
+    # Largest accepted /extract upload, in bytes
+    MAX_UPLOAD_BYTES: int = int(os.getenv("MAX_UPLOAD_BYTES", 20 * 1024 * 1024))
+
     # ==== Paths ====
     PERSIST_PATH: str = os.getenv("CLAIMS_STORE_PATH", "data/parsed_store.json")
     TEMP_DIR: str = os.getenv("TEMP_DIR", "data/tmp")
@@ -36,6 +41,7 @@ class Settings(BaseSettings):
         env_file_encoding = "utf-8"
 
 
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
-    """Helper to get current app settings instance."""
+    """Helper to get the app settings instance, built once and cached."""
     return Settings()
@@ -1,10 +1,12 @@
 from fastapi import FastAPI
 from app.routers import extract_router, ask_router
+from app.responses import ORJSONResponse
 
 app = FastAPI(
     title="Medical Claims Extraction and QA Service",
     version="1.0.0",
     description="A microservice that extracts structured data from claim documents and answers questions about them.",
+    default_response_class=ORJSONResponse,
 )
 
 # include routers
@@ -0,0 +1,27 @@
+"""
+JSON response classes shared by the API routers.
+
+Route payloads are plain dicts of JSON-native values, so they are
+serialized with orjson directly. Handlers return these responses
+themselves, which makes FastAPI skip both response_model validation
+and jsonable_encoder. Falls back to the stdlib-based JSONResponse
+when orjson is not installed.
+"""
+
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except Exception:
+    orjson = None
+
+
+class ORJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson's C serializer when available."""
+
+    def render(self, content: Any) -> bytes:
+        if orjson is None:
+            return super().render(content)
+        return orjson.dumps(content)
@@ -1,16 +1,85 @@
-from fastapi import APIRouter, HTTPException, status
+import re
+from collections import OrderedDict
+from typing import Dict, Tuple
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.exceptions import RequestValidationError
+from pydantic import ValidationError
 from app.services.storage_service import get_parsed
 from app.services.qa_service import answer_question
 
 # API schemas define request and response payloads for the endpoint
 from app.schemas import AskRequest, AskResponse
+from app.responses import ORJSONResponse
 
 # Initialize router specifically for the question-answer functionality
 router = APIRouter()
 
+# Exact-match LRU of computed answers keyed by (document_id, normalized question).
+# Entries remember the parsed document they were computed from, so a document
+# overwritten via save_parsed never serves a stale answer.
+_ANSWER_CACHE_SIZE = 10_000
+_ANSWER_CACHE: "OrderedDict[Tuple[str, str], Tuple[Dict, str]]" = OrderedDict()
+_WS = re.compile(r"\s+")
+
+
+def _normalize_question(question: str) -> str:
+    """Lowercase and collapse whitespace so trivially different phrasings share a cache entry."""
+    return _WS.sub(" ", (question or "").lower()).strip()
+
+
+def _cached_answer(document_id: str, parsed: Dict, question: str) -> str:
+    """
+    Answer a question, reusing a cached result for the same document and question.
+    """
+    normalized = _normalize_question(question)
+    key = (document_id, normalized)
+    hit = _ANSWER_CACHE.get(key)
+    if hit is not None and hit[0] is parsed:
+        _ANSWER_CACHE.move_to_end(key)
+        return hit[1]
+
+    # Answer the normalized form so every question sharing this key gets the same answer
+    answer = answer_question(parsed, normalized)
+    _ANSWER_CACHE[key] = (parsed, answer)
+    _ANSWER_CACHE.move_to_end(key)
+    if len(_ANSWER_CACHE) > _ANSWER_CACHE_SIZE:
+        _ANSWER_CACHE.popitem(last=False)
+    return answer
+
+
+async def _parse_ask_request(request: Request) -> AskRequest:
+    """
+    Validate the raw request body straight into AskRequest.
+
+    model_validate_json parses and validates in one pass without first
+    decoding the body into a Python dict. Errors are re-raised in the
+    same shape FastAPI produces for body validation failures.
+    """
+    body = await request.body()
+    try:
+        return AskRequest.model_validate_json(body)
+    except ValidationError as e:
+        raise RequestValidationError(
+            [{**err, "loc": ("body", *err["loc"])} for err in e.errors(include_url=False)]
+        )
+
 
-@router.post("/", response_model=AskResponse)
-async def ask(req: AskRequest):
+# Schemas are declared for OpenAPI only; the body is parsed by _parse_ask_request
+# and the trusted response skips re-validation
+@router.post(
+    "/",
+    response_model=None,
+    response_class=ORJSONResponse,
+    responses={status.HTTP_200_OK: {"model": AskResponse}},
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": AskRequest.model_json_schema()}},
+        }
+    },
+)
+async def ask(req: AskRequest = Depends(_parse_ask_request)):
     """
     Handles question-answering requests for a previously extracted document.
 
@@ -32,7 +101,7 @@ async def ask(req: AskRequest):
 
     # Invoke the QA service to compute the best answer from the structured data
     try:
-        answer = answer_question(parsed, req.question)
+        answer = _cached_answer(req.document_id, parsed, req.question)
     except Exception:
         # Handle any inference or runtime failures with a 500 internal server error
         raise HTTPException(
@@ -40,5 +109,6 @@ async def ask(req: AskRequest):
             detail="failed to answer question",
         )
 
-    # Send back a clean response formatted via AskResponse model
-    return {"answer": answer}
+    # Send back a clean response shaped like the AskResponse model,
+    # serialized by orjson without a jsonable_encoder pass
+    return ORJSONResponse(content={"answer": answer})
@@ -1,57 +1,169 @@
+import asyncio
+import logging
+import os
+import tempfile
 from uuid import uuid4
 from fastapi import APIRouter, UploadFile, File, HTTPException, status
 
 # Service imports implementing OCR, parsing, and storage logic
-from app.services.ocr_service import extract_text_bytes
+from app.services.ocr_service import (
+    IMAGE_EXTENSIONS,
+    SUPPORTED_EXTENSIONS,
+    extract_text_image_stream,
+    extract_text_path,
+)
 from app.services.extraction_service import parse_claim
 from app.services.storage_service import save_parsed
 
 # Pydantic response schema for standardized API output
 from app.schemas import ExtractResponse
+from app.responses import ORJSONResponse
 
 # Router dedicated to document extraction flow
 router = APIRouter()
 
+logger = logging.getLogger(__name__)
 
-@router.post("/", response_model=ExtractResponse, status_code=status.HTTP_201_CREATED)
-async def extract(file: UploadFile = File(...)):
+# Upload size limit from application settings if available
+try:
+    from app.config import get_settings
+    MAX_UPLOAD_BYTES = get_settings().MAX_UPLOAD_BYTES
+except Exception:
+    MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", 20 * 1024 * 1024))
+
+# Upload chunk size used when streaming request bodies to disk
+_UPLOAD_CHUNK_SIZE = 1 << 16
+
+
+def _upload_too_large() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+        detail=f"Uploaded file exceeds the {MAX_UPLOAD_BYTES} byte limit.",
+    )
+
+
+async def _stream_upload_to_temp(file: UploadFile) -> tuple[str, int]:
     """
-    Accepts an uploaded file (PDF or image), extracts readable text through OCR,
-    converts the text into structured claim data, stores that structured data,
-    and returns a unique document identifier alongside parsed content.
+    Copy an upload to a temporary file chunk by chunk.
+
+    Avoids holding the whole document in memory before OCR, which needs
+    a filesystem path anyway. Returns the temp path and bytes written.
+    Stops with a 413 as soon as the upload passes MAX_UPLOAD_BYTES.
     """
+    suffix = os.path.splitext(file.filename or "")[1]
+    size = 0
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
+        try:
+            while chunk := await file.read(_UPLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                if size > MAX_UPLOAD_BYTES:
+                    raise _upload_too_large()
+                tmp.write(chunk)
+        except Exception:
+            tmp.close()
+            os.remove(tmp.name)
+            raise
+    return tmp.name, size
 
-    # Create a unique identifier for linking subsequent QA requests to this document
-    document_id = str(uuid4())
 
-    # Read the uploaded file as raw binary content in a safe asynchronous manner
+def _ocr_failed(e: Exception) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        detail=f"OCR failed: {e}",
+    )
+
+
+def _upload_empty() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Uploaded file is empty.",
+    )
+
+
+async def _ocr_image_upload(file: UploadFile) -> str:
+    """
+    OCR an image upload from its spooled request file without copying it to disk.
+    """
+    if not file.size:
+        raise _upload_empty()
     try:
-        content = await file.read()
+        await file.seek(0)
+        return await asyncio.to_thread(extract_text_image_stream, file.file)
     except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed reading uploaded file: {e}",
-        )
+        raise _ocr_failed(e)
 
-    # Validate content presence to prevent empty file ingestion
-    if not content:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Uploaded file is empty.",
-        )
 
-    # Perform OCR to transform the binary content into a normalized text payload
+async def _ocr_streamed_upload(file: UploadFile) -> str:
+    """
+    Stream an upload to a temporary file and OCR it from disk.
+    """
     try:
-        ocr_text = extract_text_bytes(content, filename=(file.filename or "upload"))
+        temp_path, size = await _stream_upload_to_temp(file)
     except HTTPException:
-        # Explicitly propagate OCR-related HTTP errors to the client unchanged
         raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"OCR failed: {e}",
+            detail=f"Failed reading uploaded file: {e}",
         )
 
+    try:
+        # Validate content presence to prevent empty file ingestion
+        if not size:
+            raise _upload_empty()
+
+        # Perform OCR off the event loop to transform the stored upload into normalized text
+        try:
+            return await asyncio.to_thread(
+                extract_text_path, temp_path, filename=(file.filename or "upload")
+            )
+        except HTTPException:
+            # Explicitly propagate OCR-related HTTP errors to the client unchanged
+            raise
+        except Exception as e:
+            raise _ocr_failed(e)
+    finally:
+        # Best-effort deletion of the streamed upload
+        try:
+            os.remove(temp_path)
+        except Exception:
+            logger.debug("Failed to remove temp file %s", temp_path)
+
+
+# Schema is declared for OpenAPI only; the trusted response skips re-validation
+@router.post(
+    "/",
+    response_model=None,
+    response_class=ORJSONResponse,
+    responses={status.HTTP_201_CREATED: {"model": ExtractResponse}},
+    status_code=status.HTTP_201_CREATED,
+)
+async def extract(file: UploadFile = File(...)):
+    """
+    Accepts an uploaded file (PDF or image), extracts readable text through OCR,
+    converts the text into structured claim data, stores that structured data,
+    and returns a unique document identifier alongside parsed content.
+    """
+
+    # Create a unique identifier for linking subsequent QA requests to this document
+    document_id = str(uuid4())
+
+    # Reject unsupported or oversized uploads before copying any bytes
+    if not (file.filename or "").lower().endswith(SUPPORTED_EXTENSIONS):
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Unsupported file type; expected one of: {', '.join(SUPPORTED_EXTENSIONS)}",
+        )
+    if file.size is not None and file.size > MAX_UPLOAD_BYTES:
+        raise _upload_too_large()
+
+    # Images whose size is already known are decoded straight from the
+    # spooled upload; everything else is streamed to disk for OCR
+    if file.size is not None and (file.filename or "").lower().endswith(IMAGE_EXTENSIONS):
+        ocr_text = await _ocr_image_upload(file)
+    else:
+        ocr_text = await _ocr_streamed_upload(file)
+
     # Treat cases where OCR cannot find usable text as a user error
     if not ocr_text:
         raise HTTPException(
@@ -68,7 +180,9 @@ async def extract(file: UploadFile = File(...)):
             detail=f"Parsing failed: {e}",
         )
 
-    # Store the parsed document in memory for retrieval during QA queries
+    # Store the parsed document in memory for retrieval during QA queries.
+    # parsed is a plain dict of JSON-native values, so it can be persisted
+    # (persist=True) by the storage codec as-is, with no model dump step.
     try:
         save_parsed(document_id, parsed, persist=False)
     except Exception:
@@ -77,5 +191,9 @@ async def extract(file: UploadFile = File(...)):
             detail="Failed to save parsed document.",
         )
 
-    # Respond with the identifier the client will use in subsequent question requests
-    return {"document_id": document_id, "parsed": parsed}
+    # Respond with the identifier the client will use in subsequent question requests.
+    # Returning a Response instance skips jsonable_encoder; parsed holds only JSON-native values.
+    return ORJSONResponse(
+        content={"document_id": document_id, "parsed": parsed},
+        status_code=status.HTTP_201_CREATED,
+    )
@@ -1,6 +1,6 @@
 import re
 import logging
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set
 from datetime import datetime
 
 # Fallback local date parser if external utility is unavailable
@@ -26,20 +26,92 @@ try:
 except Exception:
     USE_LLM_EXTRACTION = False
 
+# Precompiled extraction patterns, built once at import time.
+# Keyword-only patterns also get a lowercase variant without re.I: for ASCII
+# text, lower() keeps character offsets, so they can run on a lowercased copy
+# and skip per-character case folding. re.I variants remain for other text.
+_NOISE = ["POWERED BY SMART APPLICATIONS", "PREPARED BY", "PARTNER NAME", "NET VALUE"]
+_PAT_NOISE_ALL = re.compile(r"(?:" + "|".join(re.escape(n) for n in _NOISE) + r").*", re.I)
+_PAT_NOISE_LOWER = re.compile(r"(?:" + "|".join(re.escape(n.lower()) for n in _NOISE) + r").*")
+_PAT_WS = re.compile(r"\s{2,}")
+
+# Field labels located in a single pass before any field-specific regex runs.
+# Each label is a substring every pattern for that field requires, so a field
+# whose label is absent can skip its searches. Lookahead keeps matches
+# zero-width, so overlapping labels are all reported.
+_LABELS = (
+    r"(?=(?P<name>name)|(?P<age>age|year)|(?P<diagnoses>diagnos)"
+    r"|(?P<procedures>treatment|procedure)|(?P<admission>admission|admitted)"
+    r"|(?P<discharge>discharge)|(?P<total>total|net\s+value))"
+)
+_PAT_LABELS = re.compile(_LABELS, re.I)
+_PAT_LABELS_LOWER = re.compile(_LABELS)
+
+# Name search priority: Patient → Member → Generic label
+_PAT_NAME = [
+    re.compile(p, re.I) for p in (
+        r"Patient\s*Name[:\-\s]*([A-Z][A-Za-z' -]{2,}(?:\s+[A-Z][A-Za-z' -]{2,})?)",
+        r"Member\s*Name[:\-\s]*([A-Z][A-Za-z' -]{2,}(?:\s+[A-Z][A-Za-z' -]{2,})?)",
+        r"\bName[:\-\s]*([A-Z][A-Za-z' -]{2,})",
+    )
+]
+_PAT_NAME_REJECT = re.compile(r"(invoice|scheme|insurer|value)", re.I)
+_PAT_NAME_LABEL = re.compile(r"\b(Patient|Member)\s*Name\b", re.I)
+_PAT_AGE = [re.compile(p, re.I) for p in (r"Age[:\s]*([0-9]{1,3})", r"(\d{1,3})\s+years?\b")]
+
+_PAT_DIAG_BLOCK = re.compile(
+    r"(?:Diagnosis\s*Details?|Diagnoses?)[:\s\n]*(.*?)"
+    r"(?:(?:Total|Medications?|TREATMENT|Procedure|PREPARED BY|POWERED BY|$))",
+    re.I | re.S)
+_PAT_DIAG_SKIP = re.compile(r"\b(ICD|code|amount|invoice|partner)\b", re.I)
+_PAT_ALPHA = re.compile(r"[A-Za-z]")
+
+# Single-pass medication line parser; the mandatory dose unit doubles as the drug-line filter
+_PAT_MED = re.compile(
+    r"^(?:(?P<code>\d{4,})\s+)?(?P<name>[A-Za-z0-9'()/\s-]{3,40})\s+"
+    r"(?P<dose>\d{1,4}\s*(?:mg|ml|mcg|g|%))\s+"
+    r"(?P<qty>\d{1,3})?",
+    re.I)
+
+_PAT_PROC_BLOCK = re.compile(r"(TREATMENTS?|Procedures?)(.*?)(?:Diagnosis|Total|$)", re.I | re.S)
+_PAT_PROC_SKIP = re.compile(r"Date|Description|Qty|Amount|Balance", re.I)
+_PAT_PROC_WORD = re.compile(r"[A-Za-z]{3,}")
+_PAT_PROC_DATE_PREFIX = re.compile(r"^\d{4}-\d{2}-\d{2}[-:\s\d]*")
+
+_PAT_ADMITTED = re.compile(r"\badmission|admitted\b", re.I)
+_PAT_ADMITTED_LOWER = re.compile(r"\badmission|admitted\b")
+_PAT_ADM = re.compile(r"Admission Date[:\s\-]*([^\n,]+)", re.I)
+_PAT_DISCH = re.compile(r"Discharge Date[:\s\-]*([^\n,]+)", re.I)
+
+_PAT_TOTALS = [
+    re.compile(p, re.I) for p in (
+        r"Total\s+Settlement[:\s]*([\d,]+\.\d{2})",
+        r"Net\s+Value[:\s]*([\d,]+\.\d{2})",
+        r"Total\s+Amount[:\s]*([\d,]+\.\d{2})",
+    )
+]
+
 
 def parse_claim(ocr_text: str) -> Dict:
     """
     Parse OCR text from a claim document into structured data fields.
+
+    The result contains only JSON-native values (str, int, bool, None,
+    lists and dicts); the API layer relies on this to serialize it
+    directly with orjson, without FastAPI's jsonable_encoder pass.
     """
     text = _pre_clean(ocr_text)
+    lines = text.splitlines()
+    text_lower = _ascii_lower(text)
+    labels = _find_labels(text, text_lower)
 
     parsed = {
-        "patient": _extract_patient_info(text),
-        "diagnoses": _extract_diagnoses(text),
-        "medications": _extract_medications(text),
-        "procedures": _extract_procedures(text),
-        "admission": _extract_admission(text),
-        "total_amount": _extract_total_amount(text),
+        "patient": _extract_patient_info(text, labels),
+        "diagnoses": _extract_diagnoses(text) if "diagnoses" in labels else [],
+        "medications": _extract_medications(lines),
+        "procedures": _extract_procedures(text) if "procedures" in labels else [],
+        "admission": _extract_admission(text, labels, text_lower),
+        "total_amount": _extract_total_amount(text) if "total" in labels else "",
     }
 
     parsed = _validate_parsed(parsed)
@@ -72,13 +144,39 @@ def _pre_clean(text: str) -> str:
     Remove boilerplate headers and reduce noise before extraction.
     """
     text = text or ""
-    noise = ["POWERED BY SMART APPLICATIONS", "PREPARED BY", "PARTNER NAME", "NET VALUE"]
-    for n in noise:
-        text = re.sub(re.escape(n) + ".*", "", text, flags=re.I)
-    text = re.sub(r"\s{2,}", " ", text)
+    text_lower = _ascii_lower(text)
+    if text_lower is None:
+        text = _PAT_NOISE_ALL.sub("", text)
+    else:
+        # Find noise on the lowercased copy and cut the same spans from the original
+        pieces = []
+        pos = 0
+        for m in _PAT_NOISE_LOWER.finditer(text_lower):
+            pieces.append(text[pos:m.start()])
+            pos = m.end()
+        pieces.append(text[pos:])
+        text = "".join(pieces)
+    text = _PAT_WS.sub(" ", text)
     return text.strip()
 
 
+def _ascii_lower(text: str) -> Optional[str]:
+    """
+    Return a lowercased copy of ASCII text, or None when the text is not ASCII
+    and lowercasing could shift character offsets.
+    """
+    return text.lower() if text.isascii() else None
+
+
+def _find_labels(text: str, text_lower: Optional[str] = None) -> Set[str]:
+    """
+    Return the names of the field labels present anywhere in the text.
+    """
+    if text_lower is None:
+        return {m.lastgroup for m in _PAT_LABELS.finditer(text)}
+    return {m.lastgroup for m in _PAT_LABELS_LOWER.finditer(text_lower)}
+
+
 def _validate_parsed(parsed: Dict) -> Dict:
     """
     Prune common false positives from diagnoses and medication lists.
@@ -94,34 +192,26 @@ def _validate_parsed(parsed: Dict) -> Dict:
     return parsed
 
 
-def _extract_patient_info(text: str) -> Dict:
+def _extract_patient_info(text: str, labels: Set[str]) -> Dict:
     """
     Extract patient name and age fields, reducing noise from invoice labels.
     """
     name = ""
     age = None
 
-    # Name search priority: Patient → Member → Generic label
-    name_patterns = [
-        r"Patient\s*Name[:\-\s]*([A-Z][A-Za-z' -]{2,}(?:\s+[A-Z][A-Za-z' -]{2,})?)",
-        r"Member\s*Name[:\-\s]*([A-Z][A-Za-z' -]{2,}(?:\s+[A-Z][A-Za-z' -]{2,})?)",
-        r"\bName[:\-\s]*([A-Z][A-Za-z' -]{2,})"
-    ]
-
-    for p in name_patterns:
-        m = re.search(p, text, flags=re.I)
+    for pat in _PAT_NAME if "name" in labels else ():
+        m = pat.search(text)
         if m:
             candidate = m.group(1).strip()
             # Avoid capturing invoice headers
-            if not re.search(r"(invoice|scheme|insurer|value)", candidate, re.I):
-                candidate = re.sub(r"\b(Patient|Member)\s*Name\b", "", candidate, flags=re.I).strip(" :-")
+            if not _PAT_NAME_REJECT.search(candidate):
+                candidate = _PAT_NAME_LABEL.sub("", candidate).strip(" :-")
                 name = candidate
                 break
 
     # Simple age detection
-    age_patterns = [r"Age[:\s]*([0-9]{1,3})", r"(\d{1,3})\s+years?\b"]
-    for p in age_patterns:
-        m = re.search(p, text, flags=re.I)
+    for pat in _PAT_AGE if "age" in labels else ():
+        m = pat.search(text)
         if m:
             try:
                 age = int(m.group(1))
@@ -137,40 +227,31 @@ def _extract_diagnoses(text: str) -> List[str]:
     Identify short diagnosis lines between the diagnosis header and the next section.
     """
     diagnoses = []
-    block = re.search(
-        r"(?:Diagnosis\s*Details?|Diagnoses?)[:\s\n]*(.*?)"
-        r"(?:(?:Total|Medications?|TREATMENT|Procedure|PREPARED BY|POWERED BY|$))",
-        text, flags=re.I | re.S)
+    block = _PAT_DIAG_BLOCK.search(text)
     if block:
         section = block.group(1)
         for ln in section.splitlines():
             ln = ln.strip(" .:\t")
             if not ln:
                 continue
-            if re.search(r"\b(ICD|code|amount|invoice|partner)\b", ln, re.I):
+            if _PAT_DIAG_SKIP.search(ln):
                 continue
-            if len(ln.split()) <= 6 and re.search(r"[A-Za-z]", ln):
+            if len(ln.split()) <= 6 and _PAT_ALPHA.search(ln):
                 diagnoses.append(ln)
     return diagnoses
 
 
-def _extract_medications(text: str) -> List[Dict]:
+def _extract_medications(lines: List[str]) -> List[Dict]:
     """
-    Identify drug lines by presence of dose units, then extract name, dosage, and quantity.
+    Identify drug lines by a leading name followed by a dose with units,
+    extracting name, dosage, and quantity in a single match per line.
+
+    Takes the document's pre-split lines from parse_claim.
     """
     meds = []
-    drug_lines = []
-
-    for ln in text.splitlines():
-        if re.search(r"\b(mg|ml|caps?|tab|tablet|syrup|cream)\b", ln, re.I):
-            drug_lines.append(ln.strip())
-
-    for ln in drug_lines:
-        m = re.match(
-            r"(?P<code>\d{4,}\s+)?(?P<name>[A-Za-z0-9'()/\s-]{3,40})\s+"
-            r"(?P<dose>\d{1,4}\s*(?:mg|ml|mcg|g|%)?)\s+"
-            r"(?P<qty>\d{1,3})?",
-            ln)
+
+    for ln in lines:
+        m = _PAT_MED.match(ln.strip())
         if m:
             meds.append({
                 "name": m.group("name").strip(),
@@ -186,33 +267,37 @@ def _extract_procedures(text: str) -> List[str]:
     Extract procedure or treatment descriptions from tabular sections.
     """
     procs = []
-    block = re.search(r"(TREATMENTS?|Procedures?)(.*?)(?:Diagnosis|Total|$)",
-                      text, flags=re.I | re.S)
+    block = _PAT_PROC_BLOCK.search(text)
     if block:
         section = block.group(2)
         for ln in section.splitlines():
             ln = ln.strip()
-            if re.search(r"Date|Description|Qty|Amount|Balance", ln, re.I):
+            if _PAT_PROC_SKIP.search(ln):
                 continue
-            if re.search(r"[A-Za-z]{3,}", ln):
-                clean = re.sub(r"^\d{4}-\d{2}-\d{2}[-:\s\d]*", "", ln)
+            if _PAT_PROC_WORD.search(ln):
+                clean = _PAT_PROC_DATE_PREFIX.sub("", ln)
                 procs.append(clean.strip())
     return procs
 
 
-def _extract_admission(text: str) -> Dict:
+def _extract_admission(text: str, labels: Set[str], text_lower: Optional[str] = None) -> Dict:
     """
     Determine admission status and extract any available admission or discharge dates.
     """
-    was_admitted = bool(re.search(r"\badmission|admitted\b", text, re.I))
+    was_admitted = False
     admission_date = None
     discharge_date = None
 
-    m1 = re.search(r"Admission Date[:\s\-]*([^\n,]+)", text, re.I)
-    if m1:
-        admission_date = parse_date(m1.group(1).strip())
+    if "admission" in labels:
+        if text_lower is None:
+            was_admitted = bool(_PAT_ADMITTED.search(text))
+        else:
+            was_admitted = bool(_PAT_ADMITTED_LOWER.search(text_lower))
+        m1 = _PAT_ADM.search(text)
+        if m1:
+            admission_date = parse_date(m1.group(1).strip())
 
-    m2 = re.search(r"Discharge Date[:\s\-]*([^\n,]+)", text, re.I)
+    m2 = _PAT_DISCH.search(text) if "discharge" in labels else None
     if m2:
         discharge_date = parse_date(m2.group(1).strip())
 
@@ -223,13 +308,8 @@ def _extract_total_amount(text: str) -> str:
     """
     Extract final total payable or settlement value, normalizing formatting.
     """
-    patterns = [
-        r"Total\s+Settlement[:\s]*([\d,]+\.\d{2})",
-        r"Net\s+Value[:\s]*([\d,]+\.\d{2})",
-        r"Total\s+Amount[:\s]*([\d,]+\.\d{2})"
-    ]
-    for p in patterns:
-        m = re.search(p, text, re.I)
+    for pat in _PAT_TOTALS:
+        m = pat.search(text)
         if m:
             return m.group(1).replace(",", "")
     return ""
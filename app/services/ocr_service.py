@@ -1,7 +1,8 @@
 """
 OCR-based text extraction service.
 
-This module accepts uploaded files as byte streams or file objects.
+This module accepts uploaded files as byte streams, file objects, or
+paths to files already written to disk.
 It supports native PDF text extraction with pdfplumber and falls back
 to image-based OCR with Tesseract for scanned PDFs or raster formats.
 Noise filtering and minimal normalization are applied to return a
@@ -12,7 +13,8 @@ import io
 import logging
 import tempfile
 import os
-from typing import Optional
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import BinaryIO, Optional, Union
 import re
 
 # OCR toolchain imports with graceful degradation
@@ -31,6 +33,18 @@ try:
 except Exception:
     pytesseract = None
 
+# Optional vectorized image preprocessing; PIL filters are used when unavailable
+try:
+    import cv2
+    import numpy as np
+
+    # Same 3x3 kernel as PIL's ImageFilter.SHARPEN
+    _SHARPEN_KERNEL = np.array(
+        [[-2, -2, -2], [-2, 32, -2], [-2, -2, -2]], dtype=np.float32
+    ) / 16
+except Exception:
+    cv2 = None
+
 # Fallback text normalizer if shared utility unavailable
 try:
     from app.utils.text_cleaner import clean_text
@@ -46,6 +60,18 @@ except Exception:
 
 logger = logging.getLogger(__name__)
 
+# File extensions dispatched to each extractor
+PDF_EXTENSIONS = (".pdf",)
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".jfif", ".png", ".tif", ".tiff", ".bmp", ".gif", ".webp")
+SUPPORTED_EXTENSIONS = PDF_EXTENSIONS + IMAGE_EXTENSIONS
+
+# Footer/boilerplate patterns fused into one alternation so cleanup is a single pass
+_FOOTER_NOISE = re.compile(
+    r"(?:POWERED BY SMART APPLICATIONS|PREPARED BY|PARTNER NAME|NET VALUE).*"
+    r"|PAGE\s*\d+",
+    re.IGNORECASE,
+)
+
 
 def _write_bytes_to_temp(content: bytes, filename: str = "upload") -> str:
     """
@@ -70,37 +96,16 @@ def extract_text_bytes(content: bytes, filename: str = "upload") -> str:
     """
     Perform OCR text extraction from raw bytes.
 
-    Dispatch logic selects the correct extractor based on file type.
-    A final post-processing stage removes boilerplate and formatting noise.
+    Images are decoded straight from memory. Other files are written to
+    a temporary file which is removed once extraction completes.
     """
+    if (filename or "").lower().endswith(IMAGE_EXTENSIONS):
+        return extract_text_image_stream(io.BytesIO(content))
+
     temp_path = None
     try:
         temp_path = _write_bytes_to_temp(content, filename=filename)
-        lower = (filename or "").lower()
-        text: Optional[str] = None
-
-        try:
-            # Primary dispatch by file extension
-            if lower.endswith(".pdf"):
-                text = _process_pdf(temp_path)
-            elif lower.endswith((".jpg", ".jpeg", ".png", ".tiff", ".bmp", ".gif")):
-                text = _process_image(temp_path)
-            else:
-                # Attempt PDF extraction by default if ambiguous
-                if pdfplumber is not None:
-                    try:
-                        text = _process_pdf(temp_path)
-                    except Exception:
-                        text = _process_image(temp_path)
-                else:
-                    text = _process_image(temp_path)
-        except Exception as e:
-            logger.exception("Error during file processing: %s", e)
-            raise
-
-        # Apply final cleanup and OCR artifact removal
-        cleaned = clean_text(_remove_footer_noise(text or ""))
-        return cleaned
+        return extract_text_path(temp_path, filename=filename)
     finally:
         # Best-effort deletion of temporary resources
         if temp_path:
@@ -110,6 +115,61 @@ def extract_text_bytes(content: bytes, filename: str = "upload") -> str:
                 logger.debug("Failed to remove temp file %s", temp_path)
 
 
+def extract_text_image_stream(stream: BinaryIO) -> str:
+    """
+    Perform OCR text extraction from an image read from a binary stream.
+
+    The image is decoded straight from the stream, so no temporary file
+    is written. The caller owns the stream.
+    """
+    try:
+        text = _process_image(stream)
+    except Exception as e:
+        logger.exception("Error during file processing: %s", e)
+        raise
+    return _finalize_text(text)
+
+
+def extract_text_path(file_path: str, filename: str = "upload") -> str:
+    """
+    Perform OCR text extraction from a file already on disk.
+
+    Dispatch logic selects the correct extractor based on file type.
+    A final post-processing stage removes boilerplate and formatting noise.
+    The caller owns the file and is responsible for removing it.
+    """
+    lower = (filename or "").lower()
+    text: Optional[str] = None
+
+    try:
+        # Primary dispatch by file extension
+        if lower.endswith(PDF_EXTENSIONS):
+            text = _process_pdf(file_path)
+        elif lower.endswith(IMAGE_EXTENSIONS):
+            text = _process_image(file_path)
+        else:
+            # Attempt PDF extraction by default if ambiguous
+            if pdfplumber is not None:
+                try:
+                    text = _process_pdf(file_path)
+                except Exception:
+                    text = _process_image(file_path)
+            else:
+                text = _process_image(file_path)
+    except Exception as e:
+        logger.exception("Error during file processing: %s", e)
+        raise
+
+    return _finalize_text(text)
+
+
+def _finalize_text(text: Optional[str]) -> str:
+    """
+    Apply final cleanup and OCR artifact removal to extracted text.
+    """
+    return clean_text(_remove_footer_noise(text or ""))
+
+
 def extract_text(upload_file) -> str:
     """
     Wrapper for FastAPI upload objects.
@@ -135,40 +195,79 @@ def _process_pdf(file_path: str) -> str:
     Extract text directly from a PDF if possible.
 
     Pages lacking extractable text are processed using Tesseract OCR
-    as a fallback for scanned or image-based PDFs.
+    as a fallback for scanned or image-based PDFs; such pages are
+    recognised concurrently, with a bounded number rendered at a time.
     """
     if pdfplumber is None:
         raise RuntimeError("pdfplumber is required for PDF processing but is not installed.")
 
-    text_parts = []
-    with pdfplumber.open(file_path) as pdf:
-        for page in pdf.pages:
-            try:
-                page_text = page.extract_text() or ""
-            except Exception:
-                page_text = ""
-
-            # OCR fallback for rasterized content
-            if not page_text.strip():
+    page_texts = []
+    pending = {}  # in-flight OCR future -> page index
+    workers = os.cpu_count() or 1
+    executor = None
+    try:
+        with pdfplumber.open(file_path) as pdf:
+            for idx, page in enumerate(pdf.pages):
                 try:
-                    pil_img = page.to_image(resolution=200).original
-                    page_text = pytesseract.image_to_string(
-                        pil_img,
-                        config="--psm 6 --oem 3",
-                        lang="eng"
-                    )
+                    page_text = page.extract_text() or ""
                 except Exception:
                     page_text = ""
 
-            if page_text:
-                text_parts.append(page_text)
+                # Rasterize the page for the OCR fallback; Tesseract runs as a
+                # subprocess, so threads overlap page OCR without GIL contention.
+                # At most `workers` rendered pages are held at once.
+                if not page_text.strip():
+                    page_text = ""
+                    try:
+                        pil_img = page.to_image(resolution=200).original
+                    except Exception:
+                        pil_img = None
+                    if pil_img is not None:
+                        if executor is None:
+                            executor = ThreadPoolExecutor(max_workers=workers)
+                        if len(pending) >= workers:
+                            _collect_ocr(pending, page_texts, FIRST_COMPLETED)
+                        pending[executor.submit(_ocr_one_image, pil_img)] = idx
+                        del pil_img
+
+                page_texts.append(page_text)
+
+        if pending:
+            _collect_ocr(pending, page_texts, ALL_COMPLETED)
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
 
-    return "\n\n".join(text_parts)
+    return "\n\n".join(t for t in page_texts if t)
 
 
-def _process_image(file_path: str) -> str:
+def _collect_ocr(pending: dict, page_texts: list, return_when: str) -> None:
+    """
+    Wait on in-flight page OCR and store finished results by page index.
     """
-    OCR processing pipeline for standalone images.
+    done, _ = wait(pending, return_when=return_when)
+    for future in done:
+        page_texts[pending.pop(future)] = future.result()
+
+
+def _ocr_one_image(pil_img) -> str:
+    """
+    Run Tesseract on a single rendered PDF page, returning "" on failure.
+    """
+    try:
+        return pytesseract.image_to_string(
+            pil_img,
+            config="--psm 6 --oem 3",
+            lang="eng"
+        )
+    except Exception:
+        return ""
+
+
+def _process_image(source: Union[str, BinaryIO]) -> str:
+    """
+    OCR processing pipeline for standalone images, read from a path or
+    an in-memory binary stream.
 
     Converts to grayscale, improves contrast, and applies sharpening
     to enhance Tesseract recognition accuracy.
@@ -176,10 +275,8 @@ def _process_image(file_path: str) -> str:
     if Image is None or pytesseract is None:
         raise RuntimeError("PIL and pytesseract are required for image OCR but are not installed.")
 
-    with Image.open(file_path) as img:
-        img = img.convert("L")
-        img = ImageOps.invert(img)
-        img = img.filter(ImageFilter.SHARPEN)
+    with Image.open(source) as img:
+        img = _preprocess_image(img)
         text = pytesseract.image_to_string(
             img,
             config="--psm 6 --oem 3",
@@ -189,6 +286,23 @@ def _process_image(file_path: str) -> str:
     return text
 
 
+def _preprocess_image(img):
+    """
+    Grayscale, invert, and sharpen an image ahead of OCR.
+
+    With OpenCV available the invert and sharpen run on a single NumPy
+    buffer; otherwise the equivalent PIL operations are chained.
+    """
+    if cv2 is None:
+        img = img.convert("L")
+        img = ImageOps.invert(img)
+        return img.filter(ImageFilter.SHARPEN)
+
+    arr = np.asarray(img.convert("L"), dtype=np.uint8)
+    arr = cv2.filter2D(255 - arr, -1, _SHARPEN_KERNEL)
+    return Image.fromarray(arr)
+
+
 def _remove_footer_noise(text: str) -> str:
     """
     Remove recurring boilerplate such as footers found on generated PDFs.
@@ -198,13 +312,4 @@ def _remove_footer_noise(text: str) -> str:
     """
     if not text:
         return ""
-    noise_patterns = [
-        r"POWERED BY SMART APPLICATIONS.*",
-        r"PREPARED BY.*",
-        r"PARTNER NAME.*",
-        r"NET VALUE.*",
-        r"PAGE\s*\d+",
-    ]
-    for pat in noise_patterns:
-        text = re.sub(pat, "", text, flags=re.IGNORECASE)
-    return text
+    return _FOOTER_NOISE.sub("", text)
@@ -1,6 +1,13 @@
 import logging
 import difflib
-from typing import Dict
+import re
+from typing import Dict, List, Optional
+
+# Optional C-accelerated fuzzy matching; difflib is used when unavailable
+try:
+    from rapidfuzz import fuzz, process
+except Exception:
+    fuzz = process = None
 
 logger = logging.getLogger(__name__)
 
@@ -10,72 +17,42 @@ try:
 except Exception:
     USE_LLM_QA = False
 
+# Question keywords per rule, matched against the question's word set.
+# Stems that must also catch other word forms ("subtotal", "testing",
+# "admissions") are checked as substrings.
+_WORD = re.compile(r"[a-z]+")
+_NAME_TOKS = frozenset({"name", "names", "patient", "member", "who", "whose"})
+_TOTAL_TOKS = frozenset({"amount", "amounts", "payable"})
+_MED_TOKS = frozenset({
+    "drug", "drugs", "medicine", "medicines", "medication", "medications",
+    "dose", "doses", "dosage", "mg", "tablet", "tablets", "capsule", "capsules",
+})
+_DX_TOKS = frozenset({"condition", "conditions", "disease", "diseases"})
+_PROC_TOKS = frozenset({
+    "procedure", "procedures", "treatment", "treatments",
+    "investigation", "investigations",
+})
+_ADM_TOKS = frozenset({"discharge", "discharged", "inpatient", "hospitalized"})
+
 
 def answer_question(parsed_doc: Dict, question: str) -> str:
     """
     Rule-based question answering engine for parsed claim JSON data.
+
+    The question is tokenized once and dispatched to the first rule whose
+    keywords it mentions; see _RULES for the rule order.
     """
     if not parsed_doc or not isinstance(parsed_doc, dict):
         return "No document data available."
 
     q = (question or "").lower().strip()
+    q_words = set(_WORD.findall(q))
 
-    # Patient / Member Name
-    if any(tok in q for tok in ("name", "patient", "member", "who")):
-        patient = parsed_doc.get("patient", {})
-        name = (patient.get("name") or "").strip()
-        if name:
-            name = name.replace("Member Name", "").strip(" :-")
-            return f"The patient's name is {name}."
-        return "No patient name was found in the document."
-
-    # Total Amount / Payable
-    if any(tok in q for tok in ("total", "amount", "payable", "grand total", "net value")):
-        total = parsed_doc.get("total_amount")
-        return total if total else "Total amount not found in document."
-
-    # Medication Queries
-    meds = parsed_doc.get("medications") or []
-    if meds and any(tok in q for tok in ("drug", "medicine", "medication", "dose", "mg", "tablet", "capsule")):
-        med_names = [m.get("name", "") for m in meds if m.get("name")]
-        med_name_lower = [n.lower() for n in med_names]
-
-        # Attempt fuzzy match
-        found_med = None
-        for i, name in enumerate(med_name_lower):
-            if name and (name in q or difflib.SequenceMatcher(None, name, q).ratio() > 0.6):
-                found_med = meds[i]
-                break
-
-        if found_med:
-            if "how many" in q or "quantity" in q:
-                return found_med.get("quantity") or "Quantity not specified."
-            if "dosage" in q or "mg" in q or "ml" in q:
-                return found_med.get("dosage") or "Dosage not specified."
-            return f"{found_med.get('name')} ({found_med.get('dosage') or 'no dosage info'})"
-
-        med_list = ", ".join(med_names)
-        return f"Medications mentioned: {med_list}" if med_list else "No medications found in document."
-
-    # Diagnosis Queries
-    if any(tok in q for tok in ("diagnos", "condition", "disease")):
-        dx = parsed_doc.get("diagnoses") or []
-        return ", ".join(dx) if dx else "No diagnosis found in document."
-
-    # Procedures / Tests
-    if any(tok in q for tok in ("procedure", "treatment", "test", "investigation", "scan")):
-        procs = parsed_doc.get("procedures") or []
-        return ", ".join(procs) if procs else "No procedures found in document."
-
-    # Admission Queries
-    if any(tok in q for tok in ("admit", "admission", "discharge", "inpatient", "hospitalized")):
-        adm = parsed_doc.get("admission") or {}
-        if adm.get("was_admitted"):
-            return (
-                f"Patient was admitted on {adm.get('admission_date') or 'unknown'} "
-                f"and discharged on {adm.get('discharge_date') or 'unknown'}."
-            )
-        return "Patient was not admitted."
+    for toks, stems, handler in _RULES:
+        if q_words & toks or any(stem in q for stem in stems):
+            answer = handler(parsed_doc, q)
+            if answer is not None:
+                return answer
 
     # Fallback LLM-like response
     if USE_LLM_QA:
@@ -84,6 +61,116 @@ def answer_question(parsed_doc: Dict, question: str) -> str:
     return "I could not find an answer in the document."
 
 
+def _answer_name(parsed_doc: Dict, q: str) -> str:
+    """Patient / Member Name"""
+    patient = parsed_doc.get("patient", {})
+    name = (patient.get("name") or "").strip()
+    if name:
+        name = name.replace("Member Name", "").strip(" :-")
+        return f"The patient's name is {name}."
+    return "No patient name was found in the document."
+
+
+def _answer_total(parsed_doc: Dict, q: str) -> str:
+    """Total Amount / Payable"""
+    total = parsed_doc.get("total_amount")
+    return total if total else "Total amount not found in document."
+
+
+def _answer_medications(parsed_doc: Dict, q: str) -> Optional[str]:
+    """Medication Queries; returns None so later rules apply when no medications exist."""
+    meds = parsed_doc.get("medications") or []
+    if not meds:
+        return None
+
+    named_meds = [m for m in meds if m.get("name")]
+    med_names = [m["name"] for m in named_meds]
+    med_name_lower = [n.lower() for n in med_names]
+
+    found_med = _match_medication(q, named_meds, med_name_lower)
+
+    if found_med:
+        if "how many" in q or "quantity" in q:
+            return found_med.get("quantity") or "Quantity not specified."
+        if "dosage" in q or "mg" in q or "ml" in q:
+            return found_med.get("dosage") or "Dosage not specified."
+        return f"{found_med.get('name')} ({found_med.get('dosage') or 'no dosage info'})"
+
+    med_list = ", ".join(med_names)
+    return f"Medications mentioned: {med_list}" if med_list else "No medications found in document."
+
+
+def _answer_diagnoses(parsed_doc: Dict, q: str) -> str:
+    """Diagnosis Queries"""
+    dx = parsed_doc.get("diagnoses") or []
+    return ", ".join(dx) if dx else "No diagnosis found in document."
+
+
+def _answer_procedures(parsed_doc: Dict, q: str) -> str:
+    """Procedures / Tests"""
+    procs = parsed_doc.get("procedures") or []
+    return ", ".join(procs) if procs else "No procedures found in document."
+
+
+def _answer_admission(parsed_doc: Dict, q: str) -> str:
+    """Admission Queries"""
+    adm = parsed_doc.get("admission") or {}
+    if adm.get("was_admitted"):
+        return (
+            f"Patient was admitted on {adm.get('admission_date') or 'unknown'} "
+            f"and discharged on {adm.get('discharge_date') or 'unknown'}."
+        )
+    return "Patient was not admitted."
+
+
+# Ordered (keywords, substring stems, handler) rules; the first matching rule
+# that returns an answer wins
+_RULES = (
+    (_NAME_TOKS, (), _answer_name),
+    (_TOTAL_TOKS, ("total", "net value"), _answer_total),
+    (_MED_TOKS, (), _answer_medications),
+    (_DX_TOKS, ("diagnos",), _answer_diagnoses),
+    (_PROC_TOKS, ("test", "scan"), _answer_procedures),
+    (_ADM_TOKS, ("admit", "admission"), _answer_admission),
+)
+
+
+def _match_medication(q: str, meds: List[Dict], med_name_lower: List[str]) -> Optional[Dict]:
+    """
+    Find the medication a question refers to.
+
+    Exact substring hits are checked first; fuzzy matching only runs as a
+    fallback, comparing names word-for-word with the question when
+    rapidfuzz is installed and using difflib otherwise.
+    """
+    for i, name in enumerate(med_name_lower):
+        if name and name in q:
+            return meds[i]
+
+    if process is not None:
+        # Score each name against runs of the same number of question words,
+        # so short names cannot match inside unrelated words of the question
+        q_words = _WORD.findall(q)
+        best, best_score = None, 0
+        for i, name in enumerate(med_name_lower):
+            name_words = _WORD.findall(name)
+            n = len(name_words)
+            if not n or n > len(q_words):
+                continue
+            windows = [" ".join(q_words[j:j + n]) for j in range(len(q_words) - n + 1)]
+            hit = process.extractOne(
+                " ".join(name_words), windows, scorer=fuzz.ratio, score_cutoff=80
+            )
+            if hit and hit[1] > best_score:
+                best, best_score = meds[i], hit[1]
+        return best
+
+    for i, name in enumerate(med_name_lower):
+        if name and difflib.SequenceMatcher(None, name, q).ratio() > 0.6:
+            return meds[i]
+    return None
+
+
 def _generate_answer_from_llm(parsed_doc: Dict, question: str) -> str:
     """
     Context-based fallback that synthesizes a natural language answer from document data.
@@ -3,17 +3,53 @@ Lightweight persistence layer for parsed document results.
 
 This module provides an in-memory key/value store for extracted
 document data with optional JSON file persistence. It is designed
-to support concurrent FastAPI workloads using a re-entrant lock
-for thread-safe mutations.
+to support read-heavy concurrent FastAPI workloads: documents are
+spread over independently locked shards, each holding an immutable
+mapping that writers replace copy-on-write, so lookups take no lock.
+
+Persistence is journaled. Each persisted change is queued for its
+shard's JSON-lines log next to the snapshot file, where a background
+writer appends records in batches; the snapshot is only rewritten when
+a background compaction folds the logs back into it. The snapshot holds
+one document per line and is memory-mapped on load, so a document is
+only decoded the first time it is looked up.
 
 The persistence layer is intentionally minimal and format-agnostic.
 Stored values must be JSON serializable.
 """
 
+import atexit
+import glob
 import json
+import logging
+import mmap
 import os
+import queue
 import threading
-from typing import Dict, Optional, List
+import zlib
+from contextlib import ExitStack, contextmanager
+from functools import lru_cache
+from itertools import chain
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, List, Tuple, Union
+
+# Fast C JSON codec for the disk round-trip, with a stdlib fallback
+try:
+    import orjson
+
+    _encode_json = orjson.dumps
+    _decode_json = orjson.loads
+except Exception:
+    orjson = None
+
+    # Compact separators and ASCII escaping keep the output small and
+    # let the encode step below take CPython's ASCII fast path
+    def _encode_json(obj) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode("ascii")
+
+    _decode_json = json.loads
+
+logger = logging.getLogger(__name__)
 
 # Load persistence configuration from application settings if available
 try:
@@ -23,69 +59,529 @@ try:
 except Exception:
     PERSIST_PATH = None
 
-# Primary in-memory backing store and synchronization primitive
-_STORE: Dict[str, Dict] = {}
-_STORE_LOCK = threading.RLock()
+
+# Stores are split into independently locked shards so that requests for
+# unrelated documents do not contend. A power-of-two count lets shard
+# selection use a bit mask, and crc32 keeps a document in the same shard
+# (and shard journal) across restarts, unlike the salted built-in hash().
+_NSHARDS = 1 << (max(8, os.cpu_count() or 1) - 1).bit_length()
+_SHARD_MASK = _NSHARDS - 1
+
+
+class _SnapshotRef:
+    """
+    A stored document held undecoded in the memory-mapped snapshot.
+
+    The mapping and byte range are kept in one tuple so compaction can
+    move the reference to the new snapshot with a single assignment
+    while lock-free readers use it.
+    """
+
+    __slots__ = ("_loc",)
+
+    def __init__(self, buf: mmap.mmap, start: int, end: int):
+        self._loc = (buf, start, end)
+
+    def raw(self) -> bytes:
+        """Encoded JSON value as stored in the snapshot."""
+        buf, start, end = self._loc
+        return buf[start:end]
+
+    def rebind(self, buf: mmap.mmap, start: int, end: int) -> None:
+        """Point the reference at the same value in a new snapshot."""
+        self._loc = (buf, start, end)
+
+
+# Decoded snapshot values for recently read documents. Bounded so memory
+# follows the working set; a value decoded again after eviction is a new
+# object, which callers comparing by identity just see as a changed document.
+_DECODED_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=_DECODED_CACHE_SIZE)
+def _decode_ref(ref: _SnapshotRef) -> Dict:
+    return _decode_json(ref.raw())
+
+
+class _Shard:
+    """
+    One slice of the store: its documents, a tuple of their ids, their
+    writer lock, and the size and open descriptor of the shard's journal.
+
+    The documents are a read-only mapping that is never mutated; writers
+    build a modified copy under the lock and swap it in with a single
+    attribute assignment, so readers always see a complete mapping.
+    """
+
+    def __init__(self, index: int):
+        self.index = index
+        self.store: Mapping[str, Union[Dict, _SnapshotRef]] = MappingProxyType({})
+        self.keys: Tuple[str, ...] = ()
+        self.lock = threading.Lock()
+        self.journal_bytes = 0
+        self.journal_fd: Optional[int] = None
+
+    def replace(self, store: Dict[str, Union[Dict, _SnapshotRef]]) -> None:
+        """
+        Publish a new mapping and id tuple. Must hold the shard's lock.
+        """
+        self.keys = tuple(store)
+        self.store = MappingProxyType(store)
+
+
+# Primary in-memory backing store and synchronization primitives
+_SHARDS: List[_Shard] = [_Shard(i) for i in range(_NSHARDS)]
 
 # Default persistence target if not configured
 if PERSIST_PATH is None:
     PERSIST_PATH = os.environ.get("CLAIMS_STORE_PATH", "data/parsed_store.json")
     os.makedirs(os.path.dirname(PERSIST_PATH), exist_ok=True)
 
+# Size of the snapshot file as last written or loaded
+_SNAPSHOT_BYTES = 0
+
+# Snapshot rewrites use O_DIRECT where supported; writes must cover whole blocks
+_DIRECT_IO_ALIGN = 4096
+
+# Compact once the journals outgrow twice the snapshot (and at least this many bytes)
+_COMPACT_MIN_BYTES = 1 << 20
+_COMPACT_EVENT = threading.Event()
+_COMPACT_THREAD: Optional[threading.Thread] = None
+
+# Journal records are queued by writers and appended in batches by a single
+# background thread, so request threads never block on disk I/O. Records are
+# queued under their shard's lock, so holding every shard lock and draining
+# the queue leaves the journals exactly in step with memory. Journals stay
+# open between batches and are fsynced once per batch.
+_JOURNAL_BATCH = 64
+_JOURNAL_QUEUE: "queue.Queue[Tuple[_Shard, bytes]]" = queue.Queue()
+_JOURNAL_IO_LOCK = threading.Lock()
+_JOURNAL_THREAD: Optional[threading.Thread] = None
+
+# Writers hold different shard locks, so the background workers are
+# started under this lock to ensure only one of each ever runs
+_THREAD_START_LOCK = threading.Lock()
+
+
+def _shard_index(document_id: str) -> int:
+    """Return the index of the shard owning a document id."""
+    return zlib.crc32(document_id.encode("utf-8")) & _SHARD_MASK
+
+
+def _shard(document_id: str) -> _Shard:
+    """Return the shard owning a document id."""
+    return _SHARDS[_shard_index(document_id)]
+
+
+def _journal_path(index: int) -> str:
+    """Append-only journal of a shard's changes made since the last snapshot."""
+    return f"{PERSIST_PATH}.{index}.log"
+
+
+def _append_journal(shard: _Shard, document_id: str, value: Optional[Dict]) -> None:
+    """
+    Queue one change for the shard's journal; a None value records a deletion.
+
+    Must be called while holding the shard's lock.
+    """
+    global _JOURNAL_THREAD
+    line = _encode_json({"k": document_id, "v": value}) + b"\n"
+    if _JOURNAL_THREAD is None:
+        with _THREAD_START_LOCK:
+            if _JOURNAL_THREAD is None:
+                thread = threading.Thread(target=_journal_loop, name="store-journal", daemon=True)
+                thread.start()
+                _JOURNAL_THREAD = thread
+    _JOURNAL_QUEUE.put((shard, line))
+
+
+def _journal_loop() -> None:
+    """
+    Background writer draining queued journal records in batches.
+
+    Up to _JOURNAL_BATCH pending records are grouped by journal file and
+    each file receives a single write and a single fsync. Records count
+    as flushed only once they are on stable storage.
+    """
+    while True:
+        batch = [_JOURNAL_QUEUE.get()]
+        while len(batch) < _JOURNAL_BATCH:
+            try:
+                batch.append(_JOURNAL_QUEUE.get_nowait())
+            except queue.Empty:
+                break
+        try:
+            _write_journal_batch(batch)
+        except Exception:
+            logger.exception("Failed to write %d journal records", len(batch))
+        finally:
+            for _ in batch:
+                _JOURNAL_QUEUE.task_done()
+        _maybe_schedule_compaction()
+
+
+def _write_journal_batch(batch: List[Tuple[_Shard, bytes]]) -> None:
+    """
+    Append a batch of queued records to their shard journals.
+    """
+    with _JOURNAL_IO_LOCK:
+        pending: Dict[_Shard, List[bytes]] = {}
+        for shard, line in batch:
+            pending.setdefault(shard, []).append(line)
+        for shard, lines in pending.items():
+            if shard.journal_fd is None:
+                shard.journal_fd = os.open(
+                    _journal_path(shard.index), os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644
+                )
+            chunk = b"".join(lines)
+            _write_all(shard.journal_fd, chunk)
+            shard.journal_bytes += len(chunk)
+        for shard in pending:
+            os.fsync(shard.journal_fd)
+
+
+def _write_all(fd: int, data) -> None:
+    """
+    Write a whole buffer to a file descriptor, resuming after short writes.
+    """
+    with memoryview(data) as view:
+        written = 0
+        while written < len(view):
+            written += os.write(fd, view[written:])
+
+
+def _close_journals() -> None:
+    """
+    Close every shard's journal descriptor. Must hold _JOURNAL_IO_LOCK.
+    """
+    for shard in _SHARDS:
+        if shard.journal_fd is not None:
+            os.close(shard.journal_fd)
+            shard.journal_fd = None
+
+
+def _flush_journal() -> None:
+    """
+    Block until every queued journal record has been written and synced.
+    """
+    _JOURNAL_QUEUE.join()
+
+
+def _maybe_schedule_compaction() -> None:
+    """
+    Wake the background compactor when the journals have grown too large.
+    """
+    global _COMPACT_THREAD
+    journal_bytes = sum(shard.journal_bytes for shard in _SHARDS)
+    if journal_bytes <= max(2 * _SNAPSHOT_BYTES, _COMPACT_MIN_BYTES):
+        return
+    if _COMPACT_THREAD is None:
+        with _THREAD_START_LOCK:
+            if _COMPACT_THREAD is None:
+                thread = threading.Thread(
+                    target=_compaction_loop, name="store-compactor", daemon=True
+                )
+                thread.start()
+                _COMPACT_THREAD = thread
+    _COMPACT_EVENT.set()
+
+
+def _compaction_loop() -> None:
+    """
+    Background worker folding the journals into a fresh snapshot on demand.
+    """
+    while True:
+        _COMPACT_EVENT.wait()
+        _COMPACT_EVENT.clear()
+        try:
+            _compact()
+        except Exception:
+            logger.exception("Store compaction failed")
+
+
+@contextmanager
+def _all_shards_locked():
+    """
+    Hold every shard's lock, acquired in index order.
+
+    Regular writers only ever hold one shard lock, so the fixed order
+    cannot deadlock against them.
+    """
+    with ExitStack() as stack:
+        for shard in _SHARDS:
+            stack.enter_context(shard.lock)
+        yield
+
+
+def _compact() -> None:
+    """
+    Rewrite the snapshot from memory and truncate the shard journals.
+
+    With every shard locked no new records can be queued, so queued
+    records are first drained into the journals. The last record for
+    each key in the journals then matches the snapshot, which is synced
+    and replaced atomically before the journals are emptied; a crash or
+    failed truncation in between only leaves records that replay to the
+    same state. Open journal descriptors append, so they carry on at the
+    new end of the truncated files.
+    """
+    with _all_shards_locked():
+        _flush_journal()
+        with _JOURNAL_IO_LOCK:
+            _persist_to_disk()
+            for shard in _SHARDS:
+                with open(_journal_path(shard.index), "wb"):
+                    pass
+                shard.journal_bytes = 0
+
+
+def _write_direct(path: str, lines: List[bytes], size: int) -> bool:
+    """
+    Write a snapshot with O_DIRECT, bypassing the page cache.
+
+    The lines are copied into a page-aligned anonymous mapping padded to
+    a whole number of blocks, written in one call, and the file is then
+    truncated back to its real size. Returns False without raising
+    where O_DIRECT is unavailable or rejected, such as on tmpfs.
+    """
+    direct = getattr(os, "O_DIRECT", 0)
+    if not direct:
+        return False
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | direct, 0o644)
+    except OSError:
+        return False
+    try:
+        padded = -(-size // _DIRECT_IO_ALIGN) * _DIRECT_IO_ALIGN
+        if padded:
+            with mmap.mmap(-1, padded) as buf:
+                for line in lines:
+                    buf.write(line)
+                _write_all(fd, buf)
+        os.ftruncate(fd, size)
+        os.fsync(fd)
+        return True
+    except OSError:
+        return False
+    finally:
+        os.close(fd)
+
+
+def _fsync_dir(path: str) -> None:
+    """
+    Sync a directory so a rename inside it survives a crash.
+
+    Skipped on platforms that cannot open directories for syncing.
+    """
+    try:
+        fd = os.open(path or ".", os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
 
 def _persist_to_disk():
     """
-    Atomic write of the entire store to JSON on disk.
+    Atomic write of the entire store to the snapshot file on disk.
 
-    A temporary file is written first, then moved into place
-    to avoid corruption if interrupted during write.
+    Each document is written on its own line as its JSON-encoded id, a
+    tab, and its JSON-encoded value; documents still held as snapshot
+    references are copied over as raw bytes, and afterwards point into
+    the new snapshot so the replaced file's mapping can be released. A
+    temporary file is written first, then moved into place to avoid
+    corruption if interrupted during write; the directory is synced
+    after the move so the journals are only emptied once it is durable.
+    Must be called while holding every shard's lock.
     """
+    global _SNAPSHOT_BYTES
+    lines: List[bytes] = []
+    refs: List[Tuple[_SnapshotRef, int, int]] = []
+    size = 0
+    for shard in _SHARDS:
+        for k, v in shard.store.items():
+            key = _encode_json(k)
+            if type(v) is _SnapshotRef:
+                raw = v.raw()
+                start = size + len(key) + 1
+                refs.append((v, start, start + len(raw)))
+            else:
+                raw = _encode_json(v)
+            line = b"%s\t%s\n" % (key, raw)
+            lines.append(line)
+            size += len(line)
     tmp_path = PERSIST_PATH + ".tmp"
-    with open(tmp_path, "w", encoding="utf-8") as f:
-        json.dump(_STORE, f, indent=2, ensure_ascii=False)
+    if not _write_direct(tmp_path, lines, size):
+        with open(tmp_path, "wb") as f:
+            f.writelines(lines)
+            f.flush()
+            os.fsync(f.fileno())
     os.replace(tmp_path, PERSIST_PATH)
+    _fsync_dir(os.path.dirname(PERSIST_PATH))
+    _SNAPSHOT_BYTES = size
+
+    if refs:
+        with open(PERSIST_PATH, "rb") as f:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        for ref, start, end in refs:
+            ref.rebind(buf, start, end)
+    # Cached entries may belong to documents no longer stored, whose
+    # references would otherwise keep the replaced file mapped
+    _decode_ref.cache_clear()
+
+
+def _index_snapshot(buf: mmap.mmap) -> Dict[str, _SnapshotRef]:
+    """
+    Map each document id in a snapshot to the location of its value.
+
+    Only the ids are decoded; lines without a readable id are skipped.
+    """
+    index: Dict[str, _SnapshotRef] = {}
+    pos, size = 0, len(buf)
+    while pos < size:
+        end = buf.find(b"\n", pos)
+        if end < 0:
+            end = size
+        tab = buf.find(b"\t", pos, end)
+        if tab >= 0:
+            try:
+                index[_decode_json(buf[pos:tab])] = _SnapshotRef(buf, tab + 1, end)
+            except Exception:
+                pass
+        pos = end + 1
+    return index
 
 
 def _load_from_disk():
     """
-    Initialize in-memory state from persisted JSON at startup.
+    Initialize in-memory state from the persisted snapshot and journals.
 
-    Silently skips if the file is missing or corrupted to avoid
-    preventing server startup.
+    The snapshot is memory-mapped and indexed without decoding any
+    values. A snapshot in the older single JSON object format is read
+    in full instead. Each shard journal is replayed over the snapshot
+    line by line. Journals holding any records are then folded into a
+    fresh snapshot and removed, so every journal on disk only ever holds
+    records written under the current shard layout and replays in order;
+    empty journals, as left by compaction, are kept and cost nothing.
+    Silently skips a missing or corrupted snapshot, and any unreadable
+    journal record (such as a torn final write), to avoid preventing
+    server startup.
     """
-    if not os.path.exists(PERSIST_PATH):
-        return
-    try:
-        with open(PERSIST_PATH, "r", encoding="utf-8") as f:
-            data = json.load(f)
+    global _SNAPSHOT_BYTES
+    with _all_shards_locked():
+        # Write out queued records so the files below reflect every change
+        _flush_journal()
+        data, snapshot_bytes, journals = _read_snapshot_and_journals()
 
-        with _STORE_LOCK:
-            _STORE.clear()
-            for k, v in data.items():
-                _STORE[k] = v
+        stores: List[Dict[str, Union[Dict, _SnapshotRef]]] = [{} for _ in _SHARDS]
+        for k, v in data.items():
+            stores[_shard_index(k)][k] = v
+
+        with _JOURNAL_IO_LOCK:
+            for shard, store in zip(_SHARDS, stores):
+                shard.replace(store)
+                shard.journal_bytes = 0
+            _SNAPSHOT_BYTES = snapshot_bytes
+            if journals:
+                _persist_to_disk()
+                _close_journals()
+                for path in journals:
+                    os.remove(path)
+
+
+def _read_snapshot_and_journals() -> Tuple[Dict[str, Union[Dict, _SnapshotRef]], int, List[str]]:
+    """
+    Read the snapshot and replay the shard journals over it.
+
+    Returns the merged documents, the snapshot size, and the paths of
+    the journals that held any records.
+    """
+    data: Dict[str, Union[Dict, _SnapshotRef]] = {}
+    snapshot_bytes = 0
+    try:
+        with open(PERSIST_PATH, "rb") as f:
+            snapshot_bytes = os.fstat(f.fileno()).st_size
+            if snapshot_bytes:
+                buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                if buf[:1] == b"{":
+                    data = _decode_json(buf[:])
+                else:
+                    data = _index_snapshot(buf)
+    except FileNotFoundError:
+        pass
     except Exception:
-        return
+        data = {}
+        snapshot_bytes = 0
 
+    journals: List[str] = []
+    for path in sorted(glob.glob(glob.escape(PERSIST_PATH) + ".*.log")):
+        with open(path, "rb") as f:
+            for line in f:
+                try:
+                    record = _decode_json(line)
+                    key, value = record["k"], record["v"]
+                except Exception:
+                    continue
+                if value is None:
+                    data.pop(key, None)
+                else:
+                    data[key] = value
+            if f.tell():
+                journals.append(path)
+    return data, snapshot_bytes, journals
 
-# Load persisted data opportunistically during module import
-try:
-    _load_from_disk()
-except Exception:
-    pass
+
+# Persisted data is loaded on first use rather than at import, so startup
+# does not wait on a large store
+_LOADED = False
+_LOAD_LOCK = threading.Lock()
+
+
+def _ensure_loaded() -> None:
+    """
+    Load persisted data the first time the store is used.
+
+    The flag is checked without the lock on the fast path; only the
+    first callers contend for it, and exactly one performs the load.
+    """
+    global _LOADED
+    if _LOADED:
+        return
+    with _LOAD_LOCK:
+        if _LOADED:
+            return
+        try:
+            _load_from_disk()
+        except Exception:
+            pass
+        _LOADED = True
+
+# Write out queued journal records on interpreter shutdown
+atexit.register(_flush_journal)
 
 
 def save_parsed(document_id: str, parsed_data: Dict, persist: bool = False) -> None:
     """
     Insert or update parsed document data.
 
-    If persist=True, changes are synchronized to disk within the lock.
-    Persistence failures are non-fatal for request handling.
+    If persist=True, the change is queued for the shard's on-disk journal
+    within the lock and written in the background; flush_persisted waits
+    for it to reach disk. Persistence failures are non-fatal for request
+    handling.
     """
-    with _STORE_LOCK:
-        _STORE[document_id] = parsed_data
+    _ensure_loaded()
+    shard = _shard(document_id)
+    with shard.lock:
+        store = shard.store.copy()
+        store[document_id] = parsed_data
+        shard.replace(store)
         if persist:
             try:
-                _persist_to_disk()
+                _append_journal(shard, document_id, parsed_data)
             except Exception:
                 pass
 
@@ -94,10 +590,18 @@ def get_parsed(document_id: str) -> Optional[Dict]:
     """
     Retrieve parsed data for a document_id if present.
 
-    Returns None if not found.
+    Returns None if not found, or if its snapshot record cannot be
+    decoded. Lock-free: reads the shard's current mapping, which writers
+    only ever replace.
     """
-    with _STORE_LOCK:
-        return _STORE.get(document_id)
+    _ensure_loaded()
+    value = _shard(document_id).store.get(document_id)
+    if type(value) is _SnapshotRef:
+        try:
+            return _decode_ref(value)
+        except Exception:
+            return None
+    return value
 
 
 def delete_parsed(document_id: str) -> bool:
@@ -105,13 +609,17 @@ def delete_parsed(document_id: str) -> bool:
     Remove a parsed document entry.
 
     Returns True if the entry existed, otherwise False.
-    Disk persistence is attempted on successful removal.
+    A deletion record is journaled on successful removal.
     """
-    with _STORE_LOCK:
-        if document_id in _STORE:
-            del _STORE[document_id]
+    _ensure_loaded()
+    shard = _shard(document_id)
+    with shard.lock:
+        if document_id in shard.store:
+            store = shard.store.copy()
+            del store[document_id]
+            shard.replace(store)
             try:
-                _persist_to_disk()
+                _append_journal(shard, document_id, None)
             except Exception:
                 pass
             return True
@@ -122,7 +630,20 @@ def list_all() -> List[str]:
     """
     List all stored document identifiers currently in memory.
 
-    Does not reflect persisted state if disk writes failed.
+    Each shard's id tuple is rebuilt on every write, so listing only
+    concatenates them without locking. The result is not a single atomic
+    snapshot across shards. Does not reflect persisted state if disk
+    writes failed.
+    """
+    _ensure_loaded()
+    return list(chain.from_iterable(shard.keys for shard in _SHARDS))
+
+
+def flush_persisted() -> None:
+    """
+    Block until every change saved with persist=True so far is on disk.
+
+    Persisted changes are journaled in the background; callers that must
+    not acknowledge a change before it is durable call this after saving.
     """
-    with _STORE_LOCK:
-        return list(_STORE.keys())
+    _flush_journal()
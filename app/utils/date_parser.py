@@ -10,33 +10,56 @@ No heavy NLP, just regex and datetime.strptime.
 
 import re
 from datetime import datetime
+from functools import lru_cache
 from typing import Optional
 
+# possible matches: 2023-06-10, 10/06/2023, 10-06-2023, 10 June 2023
+_DATE_RE = re.compile(
+    r"(?P<iso>\d{4}[-/]\d{1,2}[-/]\d{1,2})"        # yyyy-mm-dd
+    r"|(?P<dmy>\d{1,2}[-/]\d{1,2}[-/]\d{2,4})"     # dd-mm-yyyy or dd/mm/yyyy
+    r"|(?P<named>\d{1,2}\s+[A-Za-z]{3,9}\s+\d{4})"  # 10 June 2023
+)
+
+# every supported format contains a digit, so text without one is rejected early
+_DIGIT_RE = re.compile(r"\d")
+
+# Inputs shorter than this are memoised; field values repeat across documents
+_CACHE_MAX_LEN = 256
+
+# strptime formats that can apply to each kind of match
+_DATE_FORMATS = {
+    "iso": ("%Y-%m-%d", "%Y/%m/%d"),
+    "dmy": ("%d-%m-%Y", "%d/%m/%Y", "%d/%m/%y"),
+    "named": ("%d %B %Y", "%d %b %Y"),
+}
+
 
 def parse_date(text: str) -> Optional[str]:
     """
     Extract a date-like pattern from text and return ISO 'YYYY-MM-DD'.
     Returns None if no valid date found.
     """
-    if not text:
+    if text and len(text) < _CACHE_MAX_LEN:
+        return _parse_date_small(text)
+    return _parse_date(text)
+
+
+def _parse_date(text: str) -> Optional[str]:
+    """Uncached implementation of parse_date."""
+    if not text or not _DIGIT_RE.search(text):
         return None
 
-    # possible matches: 2023-06-10, 10/06/2023, 10-06-2023, 10 June 2023
-    patterns = [
-        r"(\d{4}[-/]\d{1,2}[-/]\d{1,2})",       # yyyy-mm-dd
-        r"(\d{1,2}[-/]\d{1,2}[-/]\d{2,4})",     # dd-mm-yyyy or dd/mm/yyyy
-        r"(\d{1,2}\s+[A-Za-z]{3,9}\s+\d{4})",   # 10 June 2023
-    ]
-
-    for p in patterns:
-        m = re.search(p, text)
-        if not m:
-            continue
-        s = m.group(1).strip()
-        for fmt in ("%Y-%m-%d", "%d-%m-%Y", "%d/%m/%Y", "%d/%m/%y", "%d %B %Y", "%d %b %Y"):
+    # single pass over the text; the first candidate that parses wins
+    for m in _DATE_RE.finditer(text):
+        s = m.group(m.lastgroup)
+        for fmt in _DATE_FORMATS[m.lastgroup]:
             try:
                 dt = datetime.strptime(s, fmt)
                 return dt.strftime("%Y-%m-%d")
             except Exception:
                 continue
     return None
+
+
+# Cached variant for short inputs
+_parse_date_small = lru_cache(maxsize=4096)(_parse_date)
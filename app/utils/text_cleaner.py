@@ -1,6 +1,37 @@
 import re
 import unicodedata
 
+_RE_WS = re.compile(r"\s{2,}")
+
+# Naira prefixes and whitespace runs, rewritten together in one pass
+_RE_AMOUNT = re.compile(r"NGN |N |\s+")
+
+
+class _PrintableTable(dict):
+    """
+    str.translate table dropping non-printable chars except newline and tab.
+
+    The Latin-1 range is filled in up front; any other code point is
+    added on its first lookup, so the table only ever holds characters
+    actually seen in OCR output. Carriage returns are mapped to newlines.
+    """
+
+    def __init__(self):
+        super().__init__((code, self._entry(code)) for code in range(256))
+        self[ord("\r")] = "\n"
+
+    @staticmethod
+    def _entry(code: int):
+        ch = chr(code)
+        return code if ch.isprintable() or ch in "\n\t" else None
+
+    def __missing__(self, code: int):
+        value = self[code] = self._entry(code)
+        return value
+
+
+_PRINTABLE_TABLE = _PrintableTable()
+
 
 def clean_text(raw_text: str) -> str:
     """
@@ -10,29 +41,29 @@ def clean_text(raw_text: str) -> str:
     if not raw_text:
         return ""
 
-    # normalize unicode characters (e.g., fancy quotes)
-    text = unicodedata.normalize("NFKC", raw_text)
-
-    # replace carriage returns with newline for consistency
-    text = text.replace("\r", "\n")
+    # normalize unicode characters (e.g., fancy quotes); ASCII text is
+    # already in NFKC form, so the common case skips the table lookups
+    text = raw_text if raw_text.isascii() else unicodedata.normalize("NFKC", raw_text)
 
+    # replace carriage returns with newline for consistency, and
     # remove non-printable or control chars except newline and tab
-    text = "".join(ch for ch in text if ch.isprintable() or ch in ["\n", "\t"])
+    text = text.translate(_PRINTABLE_TABLE)
 
-    # collapse multiple spaces and newlines
-    text = re.sub(r"[ \t]+", " ", text)
-    text = re.sub(r"\n{2,}", "\n", text)
-
-    # trim spaces at start/end of lines
-    lines = [ln.strip() for ln in text.splitlines()]
-    cleaned = "\n".join(ln for ln in lines if ln)
-
-    return cleaned.strip()
+    # collapse runs of spaces/tabs and trim each line, dropping blank lines.
+    # Newline, tab and space are the only whitespace left after the filter
+    # above, so str.split() on a line splits exactly on [ \t]+ runs.
+    lines = [" ".join(ln.split()) for ln in text.split("\n")]
+    return "\n".join(filter(None, lines))
 
 
 def remove_extra_spaces(text: str) -> str:
     """Quick helper for collapsing duplicate spaces."""
-    return re.sub(r"\s{2,}", " ", text.strip()) if text else ""
+    return _RE_WS.sub(" ", text.strip()) if text else ""
+
+
+def _amount_sub(m: re.Match) -> str:
+    """Replacement for one _RE_AMOUNT match."""
+    return "₦" if m.group()[0] == "N" else " "
 
 
 def normalize_amount(text: str) -> str:
@@ -42,7 +73,4 @@ def normalize_amount(text: str) -> str:
     """
     if not text:
         return ""
-    text = text.strip()
-    text = text.replace("NGN ", "₦").replace("N ", "₦")
-    text = re.sub(r"\s+", " ", text)
-    return text
+    return _RE_AMOUNT.sub(_amount_sub, text.strip())
@@ -0,0 +1,13 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+
+@pytest.fixture(scope="session")
+def client():
+    """
+    One TestClient for the whole test session, so the app is started once.
+    """
+    with TestClient(app) as test_client:
+        yield test_client
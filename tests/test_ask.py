@@ -1,11 +1,7 @@
-from fastapi.testclient import TestClient
-from app.main import app
 from app.services.storage_service import save_parsed
 
-client = TestClient(app)
 
-
-def test_ask_endpoint_returns_answer(monkeypatch):
+def test_ask_endpoint_returns_answer(client, monkeypatch):
     """
     Verifies that a valid question against a stored document returns an answer.
 
@@ -46,10 +42,40 @@ def test_ask_endpoint_returns_answer(monkeypatch):
     assert response.json()["answer"] == "10 tablets"
 
 
-def test_ask_returns_404_for_unknown_doc():
+def test_ask_returns_404_for_unknown_doc(client):
     """
     Requests against a missing document should return a 404 response.
     """
     payload = {"document_id": "no_such_id", "question": "Any?"}
     response = client.post("/ask/", json=payload)
     assert response.status_code == 404
+
+
+def test_ask_does_not_serve_stale_answer_after_overwrite(client):
+    """
+    Answers are cached per document and question, but re-saving a document
+    under the same id must invalidate the cached answer.
+    """
+    document_id = "overwrite123"
+    payload = {"document_id": document_id, "question": "What is the patient name?"}
+
+    save_parsed(document_id, {"patient": {"name": "Jane Doe"}})
+    assert client.post("/ask/", json=payload).json()["answer"] == "The patient's name is Jane Doe."
+
+    save_parsed(document_id, {"patient": {"name": "John Roe"}})
+    assert client.post("/ask/", json=payload).json()["answer"] == "The patient's name is John Roe."
+
+
+def test_ask_answers_questions_sharing_a_cache_key_identically(client):
+    """
+    Questions that differ only in case or spacing share a cache entry, so
+    they must get the same answer whichever of them is asked first.
+    """
+    document_id = "normalize123"
+    save_parsed(document_id, {"total_amount": "15000.00"})
+
+    spaced = {"document_id": document_id, "question": "What is the net   value?"}
+    plain = {"document_id": document_id, "question": "what is the net value?"}
+
+    assert client.post("/ask/", json=spaced).json()["answer"] == "15000.00"
+    assert client.post("/ask/", json=plain).json()["answer"] == "15000.00"
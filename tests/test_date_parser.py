@@ -0,0 +1,23 @@
+from app.utils.date_parser import parse_date
+
+
+def test_parse_date_accepts_each_supported_form():
+    """
+    ISO dates with either separator, day-first numeric dates and day-month-name
+    dates all normalize to YYYY-MM-DD.
+    """
+    assert parse_date("2023-06-10") == "2023-06-10"
+    assert parse_date("2023/06/10") == "2023-06-10"
+    assert parse_date("10/06/2023") == "2023-06-10"
+    assert parse_date("10-06-2023") == "2023-06-10"
+    assert parse_date("10 June 2023") == "2023-06-10"
+    assert parse_date("N/A") is None
+
+
+def test_parse_date_takes_the_leftmost_date():
+    """
+    When text holds several dates, the first one that parses wins,
+    whichever form it is written in.
+    """
+    assert parse_date("10 June 2023 to 2023-06-12") == "2023-06-10"
+    assert parse_date("32/13/2023 then 11/06/2023") == "2023-06-11"
@@ -1,11 +1,14 @@
+import asyncio
 import io
-from fastapi.testclient import TestClient
-from app.main import app
+import os
 
-client = TestClient(app)
+import pytest
+from fastapi import HTTPException, UploadFile
 
+from app.routers import extract_router
 
-def test_extract_endpoint_returns_valid_response(monkeypatch):
+
+def test_extract_endpoint_returns_valid_response(client, monkeypatch):
     """
     Validates that the /extract endpoint creates a parsed record and returns it
     together with a newly generated document_id.
@@ -25,7 +28,10 @@ def test_extract_endpoint_returns_valid_response(monkeypatch):
     }
 
     # Inject deterministic behavior for OCR and parsing logic
-    monkeypatch.setattr("app.routers.extract_router.extract_text", lambda f: fake_text)
+    monkeypatch.setattr(
+        "app.routers.extract_router.extract_text_path",
+        lambda path, filename="upload": fake_text,
+    )
     monkeypatch.setattr("app.routers.extract_router.parse_claim", lambda t: fake_parsed)
 
     # Construct an in-memory PDF upload to simulate client submission
@@ -46,3 +52,77 @@ def test_extract_endpoint_returns_valid_response(monkeypatch):
     # Basic checks confirming that parsing fits expected shape
     assert data["parsed"]["patient"]["name"] == "Jane Doe"
     assert isinstance(data["parsed"]["diagnoses"], list)
+
+
+def test_extract_rejects_unsupported_extension(client):
+    """
+    Uploads whose extension no extractor handles are refused with 415.
+    """
+    response = client.post(
+        "/extract/",
+        files={"file": ("notes.txt", io.BytesIO(b"hello"), "text/plain")},
+    )
+    assert response.status_code == 415
+
+
+def test_extract_rejects_oversized_upload(client, monkeypatch):
+    """
+    Uploads larger than MAX_UPLOAD_BYTES are refused with 413 before OCR runs.
+    """
+    monkeypatch.setattr("app.routers.extract_router.MAX_UPLOAD_BYTES", 8)
+    response = client.post(
+        "/extract/",
+        files={"file": ("scan.png", io.BytesIO(b"x" * 9), "image/png")},
+    )
+    assert response.status_code == 413
+
+
+def test_stream_upload_stops_at_size_limit(monkeypatch):
+    """
+    When the upload size is not known up front, streaming to disk stops
+    with 413 once the limit is passed and leaves no temp file behind.
+    """
+    monkeypatch.setattr(extract_router, "MAX_UPLOAD_BYTES", 8)
+    monkeypatch.setattr(extract_router, "_UPLOAD_CHUNK_SIZE", 4)
+    created = []
+    real_tempfile = extract_router.tempfile.NamedTemporaryFile
+
+    def tracking_tempfile(*args, **kwargs):
+        tmp = real_tempfile(*args, **kwargs)
+        created.append(tmp.name)
+        return tmp
+
+    monkeypatch.setattr(extract_router.tempfile, "NamedTemporaryFile", tracking_tempfile)
+    upload = UploadFile(file=io.BytesIO(b"x" * 12), filename="scan.png")
+
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(extract_router._stream_upload_to_temp(upload))
+
+    assert exc.value.status_code == 413
+    assert created and not os.path.exists(created[0])
+
+
+def test_extract_reads_image_uploads_without_a_temp_file(client, monkeypatch):
+    """
+    Image uploads are handed to OCR as the spooled request stream rather
+    than being copied to a temporary file first.
+    """
+    seen = []
+
+    def fake_ocr(stream):
+        seen.append(stream.read())
+        return "Patient Name: Jane Doe"
+
+    def no_temp_copy(file):
+        raise AssertionError("image upload was streamed to a temp file")
+
+    monkeypatch.setattr(extract_router, "extract_text_image_stream", fake_ocr)
+    monkeypatch.setattr(extract_router, "_stream_upload_to_temp", no_temp_copy)
+
+    response = client.post(
+        "/extract/",
+        files={"file": ("scan.png", io.BytesIO(b"png bytes"), "image/png")},
+    )
+
+    assert response.status_code == 201
+    assert seen == [b"png bytes"]
@@ -0,0 +1,23 @@
+from app.services.extraction_service import parse_claim
+
+
+def test_parse_claim_extracts_medications_with_dose_units():
+    """
+    Medication lines are recognised by a name followed by a dose with units.
+
+    Lines without a unit-bearing dose (e.g. bare product names) are skipped,
+    and an optional leading item code is not included in the drug name.
+    """
+    text = (
+        "Medications\n"
+        "1234 Paracetamol 500mg 10\n"
+        "Amoxicillin caps 250 mg 21\n"
+        "Vitamin C syrup\n"
+    )
+
+    meds = parse_claim(text)["medications"]
+
+    assert meds == [
+        {"name": "Paracetamol", "dosage": "500mg", "quantity": "10"},
+        {"name": "Amoxicillin caps", "dosage": "250 mg", "quantity": "21"},
+    ]
@@ -0,0 +1,52 @@
+from app.services.qa_service import answer_question
+
+PARSED_DOC = {
+    "patient": {"name": "Jane Doe", "age": 34},
+    "diagnoses": ["Malaria"],
+    "medications": [{"name": "Paracetamol", "dosage": "500mg", "quantity": "10"}],
+    "procedures": ["Malaria test"],
+    "admission": {
+        "was_admitted": True,
+        "admission_date": "2023-06-10",
+        "discharge_date": "2023-06-12",
+    },
+    "total_amount": "15000.00",
+}
+
+
+def test_answer_question_routes_by_whole_words():
+    """
+    Question keywords are matched as whole words, so "inpatient" selects the
+    admission rule rather than the patient-name rule.
+    """
+    answer = answer_question(PARSED_DOC, "Was this an inpatient stay?")
+    assert answer == "Patient was admitted on 2023-06-10 and discharged on 2023-06-12."
+
+    assert answer_question(PARSED_DOC, "Who is the patient?") == "The patient's name is Jane Doe."
+    assert answer_question(PARSED_DOC, "What was the diagnosis?") == "Malaria"
+    assert answer_question(PARSED_DOC, "What is the net value?") == "15000.00"
+
+
+def test_generic_medication_question_lists_every_medication():
+    """
+    Short drug names are not fuzzy-matched inside unrelated question words,
+    so "given" does not select "Iron".
+    """
+    doc = dict(PARSED_DOC)
+    doc["medications"] = PARSED_DOC["medications"] + [{"name": "Iron", "dosage": "200mg"}]
+
+    answer = answer_question(doc, "What medications were given?")
+    assert answer == "Medications mentioned: Paracetamol, Iron"
+    assert answer_question(doc, "What dose of paracetmol?") == "Paracetamol (500mg)"
+
+
+def test_answer_question_matches_stems_inside_longer_words():
+    """
+    Stems still route plural and derived forms the way substring matching did.
+    """
+    admitted = "Patient was admitted on 2023-06-10 and discharged on 2023-06-12."
+    assert answer_question(PARSED_DOC, "How many admissions?") == admitted
+    assert answer_question(PARSED_DOC, "What was the subtotal?") == "15000.00"
+    assert answer_question(PARSED_DOC, "Was any testing done?") == "Malaria test"
+    assert answer_question(PARSED_DOC, "Any scanning done?") == "Malaria test"
+    assert answer_question(PARSED_DOC, "What dosage of paracetamol?") == "500mg"
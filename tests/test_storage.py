@@ -0,0 +1,161 @@
+import pytest
+
+from app.services import storage_service
+
+
+@pytest.fixture
+def isolated_store(tmp_path, monkeypatch):
+    """
+    Point the storage layer at an empty store backed by files under tmp_path.
+    """
+    monkeypatch.setattr(storage_service, "PERSIST_PATH", str(tmp_path / "parsed_store.json"))
+    monkeypatch.setattr(storage_service, "_LOADED", True)
+    monkeypatch.setattr(
+        storage_service,
+        "_SHARDS",
+        [storage_service._Shard(i) for i in range(storage_service._NSHARDS)],
+    )
+    return storage_service
+
+
+def test_persisted_changes_survive_reload(isolated_store):
+    """
+    Persisted saves and deletes are journaled, and replaying the journal on
+    load reproduces the in-memory state; unpersisted saves are not restored.
+    """
+    isolated_store.save_parsed("keep", {"total_amount": "100.00"}, persist=True)
+    isolated_store.save_parsed("drop", {"total_amount": "5.00"}, persist=True)
+    isolated_store.save_parsed("memory-only", {"total_amount": "1.00"})
+    assert isolated_store.delete_parsed("drop")
+
+    isolated_store._load_from_disk()
+
+    assert isolated_store.list_all() == ["keep"]
+    assert isolated_store.get_parsed("keep") == {"total_amount": "100.00"}
+
+
+def test_compaction_folds_journal_into_snapshot(isolated_store):
+    """
+    Compaction rewrites the snapshot and empties the shard journals without
+    losing any persisted entries.
+    """
+    isolated_store.save_parsed("a", {"diagnoses": ["Malaria"]}, persist=True)
+    isolated_store.save_parsed("b", {"diagnoses": ["Typhoid"]}, persist=True)
+
+    isolated_store._compact()
+
+    for index in range(isolated_store._NSHARDS):
+        with open(isolated_store._journal_path(index), "rb") as f:
+            assert f.read() == b""
+
+    isolated_store._load_from_disk()
+    assert sorted(isolated_store.list_all()) == ["a", "b"]
+    assert isolated_store.get_parsed("b") == {"diagnoses": ["Typhoid"]}
+
+
+def test_snapshot_values_decode_on_first_lookup(isolated_store):
+    """
+    Reloaded snapshot entries stay undecoded until looked up, and then
+    return the same object on every lookup.
+    """
+    isolated_store.save_parsed("a", {"total_amount": "7.50"}, persist=True)
+    isolated_store._compact()
+    isolated_store._load_from_disk()
+
+    shard = isolated_store._shard("a")
+    assert type(shard.store["a"]) is isolated_store._SnapshotRef
+
+    first = isolated_store.get_parsed("a")
+    assert first == {"total_amount": "7.50"}
+    assert isolated_store.get_parsed("a") is first
+
+
+def test_interrupted_compaction_replays_to_the_snapshot_state(isolated_store, monkeypatch):
+    """
+    If the journals cannot be truncated after the snapshot is replaced,
+    replaying them must not bring back older values or deleted documents.
+    """
+    isolated_store.save_parsed("a", {"v": 1}, persist=True)
+    isolated_store.save_parsed("b", {"v": 1}, persist=True)
+    isolated_store._flush_journal()
+    isolated_store.save_parsed("a", {"v": 2}, persist=True)
+    isolated_store.delete_parsed("b")
+
+    def open_without_truncate(path, mode="r", *args, **kwargs):
+        if mode == "wb" and str(path).endswith(".log"):
+            raise OSError("disk full")
+        return open(path, mode, *args, **kwargs)
+
+    with monkeypatch.context() as m:
+        m.setattr(isolated_store, "open", open_without_truncate, raising=False)
+        with pytest.raises(OSError):
+            isolated_store._compact()
+
+    isolated_store._load_from_disk()
+    assert isolated_store.list_all() == ["a"]
+    assert isolated_store.get_parsed("a") == {"v": 2}
+
+
+def test_reload_after_compaction_does_not_rewrite_snapshot(isolated_store, monkeypatch):
+    """
+    Compaction leaves the journals empty, so the next load has nothing to
+    fold and must not rewrite the snapshot.
+    """
+    isolated_store.save_parsed("a", {"v": 1}, persist=True)
+    isolated_store._compact()
+
+    rewrites = []
+    monkeypatch.setattr(isolated_store, "_persist_to_disk", lambda: rewrites.append(1))
+    isolated_store._load_from_disk()
+
+    assert rewrites == []
+    assert isolated_store.get_parsed("a") == {"v": 1}
+
+
+def test_compaction_moves_snapshot_refs_to_the_new_snapshot(isolated_store):
+    """
+    Undecoded documents are re-pointed at the rewritten snapshot, so the
+    replaced file's mapping is no longer referenced.
+    """
+    isolated_store.save_parsed("a", {"v": 1}, persist=True)
+    isolated_store._compact()
+    isolated_store._load_from_disk()
+    ref = isolated_store._shard("a").store["a"]
+    old_buf = ref._loc[0]
+
+    isolated_store.save_parsed("b", {"v": 2}, persist=True)
+    isolated_store._compact()
+
+    assert ref._loc[0] is not old_buf
+    assert isolated_store.get_parsed("a") == {"v": 1}
+
+
+def test_journal_writes_resume_after_short_writes(isolated_store, monkeypatch):
+    """
+    A write that stores only part of a batch is continued, so no journal
+    record is silently cut short.
+    """
+    real_write = isolated_store.os.write
+    with monkeypatch.context() as m:
+        m.setattr(isolated_store.os, "write", lambda fd, data: real_write(fd, data[:3]))
+        isolated_store.save_parsed("a", {"diagnoses": ["Malaria"]}, persist=True)
+        isolated_store._flush_journal()
+
+    shard = isolated_store._shard("a")
+    with open(isolated_store._journal_path(shard.index), "rb") as f:
+        assert len(f.read()) == shard.journal_bytes
+
+    isolated_store._load_from_disk()
+    assert isolated_store.get_parsed("a") == {"diagnoses": ["Malaria"]}
+
+
+def test_flush_persisted_waits_for_the_journal_write(isolated_store):
+    """
+    Once flush_persisted returns, a persisted save is in its shard journal.
+    """
+    isolated_store.save_parsed("durable", {"total_amount": "7.00"}, persist=True)
+    isolated_store.flush_persisted()
+
+    index = isolated_store._shard_index("durable")
+    with open(isolated_store._journal_path(index), "rb") as f:
+        assert b'"durable"' in f.read()